@@ -1,9 +1,17 @@
+import math
+import operator
 import os
-from typing import List, Optional
+import queue
+import threading
+from typing import Any, List, Optional, Tuple
 
-from fastapi import FastAPI, HTTPException, Path, status
+import anyio.to_thread
+from cachetools import TTLCache
+
+from fastapi import Body, FastAPI, HTTPException, Path, Request, status
 from fastapi.middleware.cors import CORSMiddleware
-from pydantic import BaseModel, Field, validator
+from fastapi.responses import ORJSONResponse
+from pydantic import BaseModel, ConfigDict, Field
 import sqlite3
 from contextlib import contextmanager
 
@@ -28,23 +36,142 @@ def _sqlite_path_from_url(url: str) -> str:
 
 DB_FILE_PATH = _sqlite_path_from_url(DEFAULT_DB_PATH)
 
+# Ensure directory exists for relative db paths; done once at import rather than in each startup handler
+_DB_DIR = os.path.dirname(DB_FILE_PATH)
+if _DB_DIR:
+    os.makedirs(_DB_DIR, exist_ok=True)
+
+
+# Per-connection SQLite tuning applied to every connection we open.
+# journal_mode=WAL is persisted in the database file itself, so it is set once in init_db().
+SQLITE_CONNECTION_PRAGMAS = (
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA cache_size=-64000",
+    "PRAGMA busy_timeout=5000",
+)
+
+
+# Hot-path SQL kept as module constants; the per-connection statement cache (SQLITE_CACHED_STATEMENTS)
+# then reuses the prepared statements across requests on pooled connections.
+_PRODUCT_COLUMNS = "id, name, price, quantity"
+_SQL_GET_ONE = f"SELECT {_PRODUCT_COLUMNS} FROM products WHERE id = ?"
+_SQL_LIST = f"SELECT {_PRODUCT_COLUMNS} FROM products ORDER BY id ASC"
+_SQL_ID_RANGE = f"SELECT {_PRODUCT_COLUMNS} FROM products WHERE id BETWEEN ? AND ? ORDER BY id ASC"
+_SQL_INSERT = "INSERT INTO products (name, price, quantity) VALUES (?, ?, ?)"
+_SQL_UPDATE = "UPDATE products SET {assignments} WHERE id = ? RETURNING " + _PRODUCT_COLUMNS
+_SQL_DELETE = "DELETE FROM products WHERE id = ?"
+_SQL_LAST_ROWID = "SELECT last_insert_rowid()"
+_SQL_TOTAL = "SELECT total_cents FROM inventory_totals WHERE id = 1"
+_SQL_PRICE_QUANTITY = "SELECT price, quantity FROM products"
+SQLITE_CACHED_STATEMENTS = 256
+
+
+def _connect(read_only: bool = False) -> sqlite3.Connection:
+    """Open a tuned SQLite connection in autocommit mode (transactions are managed explicitly)."""
+    conn = sqlite3.connect(
+        DB_FILE_PATH,
+        check_same_thread=False,
+        isolation_level=None,
+        cached_statements=SQLITE_CACHED_STATEMENTS,
+    )
+    for pragma in SQLITE_CONNECTION_PRAGMAS:
+        conn.execute(pragma)
+    if read_only:
+        conn.execute("PRAGMA query_only=1")
+    conn.row_factory = sqlite3.Row
+    return conn
+
+
+# SQLite in WAL mode allows many concurrent readers but only one writer, so connections are split:
+# a pool of read-only connections (reused to keep page caches warm) and a single lock-guarded writer.
+# The default is at least anyio's stock 40 worker threads, since the thread limit is derived from it (see below).
+DB_READER_POOL_SIZE = int(os.getenv("DB_READER_POOL_SIZE", str(max(40, (os.cpu_count() or 4) * 2))))
+if DB_READER_POOL_SIZE < 1:
+    # LifoQueue(maxsize<=0) is unbounded, so init_pool would open connections until descriptors run out
+    raise ValueError(f"DB_READER_POOL_SIZE must be at least 1, got {DB_READER_POOL_SIZE}")
+_READERS: "queue.LifoQueue[sqlite3.Connection]" = queue.LifoQueue(maxsize=DB_READER_POOL_SIZE)
+_WRITER: Optional[sqlite3.Connection] = None
+_WRITER_LOCK = threading.Lock()
+# Seconds a request waits for an idle reader before failing instead of hanging
+DB_POOL_TIMEOUT = float(os.getenv("DB_POOL_TIMEOUT", "5"))
+
+
+class DatabasePoolTimeout(RuntimeError):
+    """Raised when no reader connection frees up within DB_POOL_TIMEOUT; served as 503 (server busy)."""
+
+
+def init_pool():
+    """Open the writer connection and fill the reader pool up to DB_READER_POOL_SIZE connections."""
+    global _WRITER
+    with _WRITER_LOCK:
+        if _WRITER is None:
+            _WRITER = _connect()
+    while not _READERS.full():
+        _READERS.put_nowait(_connect(read_only=True))
+
+
+def close_pool():
+    """Close the writer connection and drain all idle reader connections."""
+    global _WRITER
+    with _WRITER_LOCK:
+        if _WRITER is not None:
+            _WRITER.close()
+            _WRITER = None
+    while True:
+        try:
+            conn = _READERS.get_nowait()
+        except queue.Empty:
+            return
+        conn.close()
+
 
 @contextmanager
-def get_db_cursor():
-    """Context manager for SQLite connection and cursor with row factory."""
-    conn = sqlite3.connect(DB_FILE_PATH, check_same_thread=False)
+def get_reader():
+    """Context manager checking out a read-only pooled connection and yielding a cursor (no transaction)."""
+    if _WRITER is None:
+        # Pool is opened on startup and closed on shutdown; fail fast outside that window
+        raise RuntimeError("Database connection pool is not initialized")
+    try:
+        conn = _READERS.get(timeout=DB_POOL_TIMEOUT)
+    except queue.Empty:
+        raise DatabasePoolTimeout(f"No database reader connection available within {DB_POOL_TIMEOUT}s") from None
+    cur = conn.cursor()
     try:
-        conn.row_factory = sqlite3.Row
-        cur = conn.cursor()
         yield cur
-        conn.commit()
     finally:
-        conn.close()
+        # Reads never commit; closing the cursor resets any unfinished statement so the implicit
+        # read transaction ends and the pooled connection does not keep serving a stale WAL snapshot.
+        cur.close()
+        _READERS.put(conn)
+
+
+@contextmanager
+def get_writer():
+    """Context manager yielding a cursor on the single writer connection inside BEGIN IMMEDIATE/COMMIT."""
+    with _WRITER_LOCK:
+        if _WRITER is None:
+            raise RuntimeError("Database connection pool is not initialized")
+        cur = _WRITER.cursor()
+        # IMMEDIATE takes the write lock up front, so writers in other worker processes wait on
+        # busy_timeout instead of failing when a deferred read transaction tries to upgrade.
+        cur.execute("BEGIN IMMEDIATE")
+        try:
+            yield cur
+            cur.execute("COMMIT")
+        except BaseException:
+            # Also covers a failed COMMIT: never leave the shared writer inside an open transaction
+            if _WRITER.in_transaction:
+                _WRITER.rollback()
+            raise
 
 
 def init_db():
     """Initialize the SQLite database with the products table if it does not exist."""
-    with get_db_cursor() as cur:
+    # WAL lets readers proceed while a write is in progress; it cannot be switched inside a transaction.
+    with _WRITER_LOCK:
+        _WRITER.execute("PRAGMA journal_mode=WAL")
+    with get_writer() as cur:
         cur.execute(
             """
             CREATE TABLE IF NOT EXISTS products (
@@ -55,6 +182,59 @@ def init_db():
             )
             """
         )
+        # Single-row running inventory value kept current by triggers, so the balance endpoint is O(1).
+        # The total is held as exact integer cents (prices are stored rounded to 2 decimals), so repeated
+        # adds and subtracts never drift. Table and triggers are recreated and the total rebuilt from
+        # products on every startup, which seeds existing databases and applies definition changes.
+        for trigger in ("trg_products_total_insert", "trg_products_total_delete", "trg_products_total_update"):
+            cur.execute(f"DROP TRIGGER IF EXISTS {trigger}")
+        cur.execute("DROP TABLE IF EXISTS inventory_totals")
+        cur.execute(
+            """
+            CREATE TABLE inventory_totals (
+                id INTEGER PRIMARY KEY CHECK(id = 1),
+                total_cents INTEGER NOT NULL DEFAULT 0
+            )
+            """
+        )
+        cur.execute(
+            """
+            CREATE TRIGGER trg_products_total_insert AFTER INSERT ON products
+            BEGIN
+                UPDATE inventory_totals
+                SET total_cents = total_cents + CAST(ROUND(NEW.price * 100) AS INTEGER) * NEW.quantity
+                WHERE id = 1;
+            END
+            """
+        )
+        cur.execute(
+            """
+            CREATE TRIGGER trg_products_total_delete AFTER DELETE ON products
+            BEGIN
+                UPDATE inventory_totals
+                SET total_cents = total_cents - CAST(ROUND(OLD.price * 100) AS INTEGER) * OLD.quantity
+                WHERE id = 1;
+            END
+            """
+        )
+        cur.execute(
+            """
+            CREATE TRIGGER trg_products_total_update AFTER UPDATE OF price, quantity ON products
+            BEGIN
+                UPDATE inventory_totals
+                SET total_cents = total_cents
+                    + CAST(ROUND(NEW.price * 100) AS INTEGER) * NEW.quantity
+                    - CAST(ROUND(OLD.price * 100) AS INTEGER) * OLD.quantity
+                WHERE id = 1;
+            END
+            """
+        )
+        cur.execute(
+            """
+            INSERT INTO inventory_totals (id, total_cents)
+            SELECT 1, COALESCE(SUM(CAST(ROUND(price * 100) AS INTEGER) * quantity), 0) FROM products
+            """
+        )
 
 
 # PUBLIC_INTERFACE
@@ -64,11 +244,6 @@ class ProductCreate(BaseModel):
     price: float = Field(..., description="The product's price, must be non-negative", ge=0)
     quantity: int = Field(..., description="Available quantity, must be non-negative integer", ge=0)
 
-    @validator("price")
-    def validate_price(cls, v):
-        # Round to 2 decimal places to avoid floating artifacts
-        return round(float(v), 2)
-
 
 # PUBLIC_INTERFACE
 class ProductUpdate(BaseModel):
@@ -77,51 +252,107 @@ class ProductUpdate(BaseModel):
     price: Optional[float] = Field(None, description="Updated price, must be non-negative", ge=0)
     quantity: Optional[int] = Field(None, description="Updated quantity, must be non-negative integer", ge=0)
 
-    @validator("price")
-    def validate_price(cls, v):
-        if v is None:
-            return v
-        return round(float(v), 2)
-
 
 # PUBLIC_INTERFACE
 class Product(BaseModel):
     """Product response model with id."""
+    # Instances are built from DB rows via model_construct and shared through the read cache
+    model_config = ConfigDict(frozen=True, from_attributes=True)
+
     id: int = Field(..., description="Unique identifier of the product")
     name: str = Field(..., description="The product's name")
     price: float = Field(..., description="The product's price")
     quantity: int = Field(..., description="Available quantity")
 
 
+# In-process read cache for product lookups and the full listing, invalidated on every successful write.
+# Each worker process holds its own cache, so other workers may serve entries up to PRODUCT_CACHE_TTL old.
+# The generation counter stops a read that raced with a write from caching the pre-write result.
+PRODUCT_CACHE_TTL = float(os.getenv("PRODUCT_CACHE_TTL", "60"))
+_PRODUCT_CACHE: TTLCache = TTLCache(maxsize=4096, ttl=PRODUCT_CACHE_TTL)
+_PRODUCT_LIST_CACHE: TTLCache = TTLCache(maxsize=1, ttl=PRODUCT_CACHE_TTL)
+_PRODUCT_LIST_KEY = "all"
+_CACHE_LOCK = threading.Lock()
+_cache_generation = 0
+
+
+def _cache_get(cache: TTLCache, key: Any) -> Tuple[Any, int]:
+    """Return (cached value or None, current cache generation)."""
+    with _CACHE_LOCK:
+        return cache.get(key), _cache_generation
+
+
+def _cache_put(cache: TTLCache, key: Any, value: Any, generation: int):
+    """Store value unless a write has invalidated the cache since `generation` was read."""
+    with _CACHE_LOCK:
+        if generation == _cache_generation:
+            cache[key] = value
+
+
+def invalidate_product_cache(product_id: Optional[int] = None):
+    """Drop the cached listing and, if given, the cached entry for product_id."""
+    global _cache_generation
+    with _CACHE_LOCK:
+        _cache_generation += 1
+        if product_id is not None:
+            _PRODUCT_CACHE.pop(product_id, None)
+        _PRODUCT_LIST_CACHE.clear()
+
+
 app = FastAPI(
     title="Product Management API",
     description="CRUD API for managing products with fields: id, name, price, quantity.",
     version="1.0.0",
+    default_response_class=ORJSONResponse,
     openapi_tags=[
         {"name": "health", "description": "Healthcheck endpoint"},
         {"name": "products", "description": "Operations with products"},
     ],
 )
 
+# Comma-separated allowed origins. With the default "*" credentials are disabled, so the middleware can
+# send a literal "*" rather than echoing each request's Origin; list explicit origins to allow credentials.
+CORS_ALLOW_ORIGINS = [o.strip() for o in os.getenv("CORS_ALLOW_ORIGINS", "*").split(",") if o.strip()]
+
 app.add_middleware(
     CORSMiddleware,
-    allow_origins=["*"],  # In production, restrict this
-    allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
+    allow_origins=CORS_ALLOW_ORIGINS,
+    allow_credentials="*" not in CORS_ALLOW_ORIGINS,
+    allow_methods=["GET", "POST", "PUT", "DELETE"],
+    allow_headers=["Content-Type", "Authorization"],
 )
 
 
+@app.exception_handler(DatabasePoolTimeout)
+def database_pool_timeout_handler(request: Request, exc: DatabasePoolTimeout):
+    """Report reader pool exhaustion as a retryable 503 rather than an unhandled 500."""
+    return ORJSONResponse(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        content={"detail": str(exc)},
+        headers={"Retry-After": "1"},
+    )
+
+
+# Sync endpoints run on anyio's worker thread pool. Size it to one thread per reader plus one for the writer:
+# extra threads add no read concurrency, they only wait on reader checkout and turn queuing into 503s once
+# DB_POOL_TIMEOUT expires. Requests beyond this limit queue on the thread limiter instead, without a timeout.
+THREADPOOL_SIZE = DB_READER_POOL_SIZE + 1
+
+
 @app.on_event("startup")
 def on_startup():
     """Initialize database on startup."""
-    # Ensure directory exists for relative db paths
-    db_dir = os.path.dirname(DB_FILE_PATH)
-    if db_dir and not os.path.exists(db_dir):
-        os.makedirs(db_dir, exist_ok=True)
+    anyio.to_thread.current_default_thread_limiter().total_tokens = THREADPOOL_SIZE
+    init_pool()
     init_db()
 
 
+@app.on_event("shutdown")
+def on_shutdown():
+    """Release pooled database connections on shutdown."""
+    close_pool()
+
+
 # PUBLIC_INTERFACE
 @app.get("/", tags=["health"], summary="Health Check", description="Simple health check endpoint returning a status.")
 def health_check():
@@ -129,16 +360,47 @@ def health_check():
     return {"message": "Healthy"}
 
 
+# PUBLIC_INTERFACE
+@app.get(
+    "/pool-health",
+    tags=["health"],
+    summary="Connection pool health",
+    description="Returns active/idle counts for the reader connection pool and whether the writer is busy.",
+)
+def pool_health():
+    """Report database connection usage for the reader pool and the single writer connection."""
+    idle = _READERS.qsize()
+    return {
+        "readers": {"size": DB_READER_POOL_SIZE, "active": DB_READER_POOL_SIZE - idle, "idle": idle},
+        "writer": {"busy": _WRITER_LOCK.locked()},
+    }
+
+
 # Data access helpers
+def _product_from_row(row: sqlite3.Row) -> Product:
+    """Build a Product from a DB row without re-validation; the table's constraints already guarantee the schema."""
+    return Product.model_construct(id=row["id"], name=row["name"], price=row["price"], quantity=row["quantity"])
+
+
 def fetch_product_or_404(product_id: int) -> sqlite3.Row:
-    with get_db_cursor() as cur:
-        cur.execute("SELECT id, name, price, quantity FROM products WHERE id = ?", (product_id,))
+    with get_reader() as cur:
+        cur.execute(_SQL_GET_ONE, (product_id,))
         row = cur.fetchone()
         if not row:
             raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=f"Product {product_id} not found")
         return row
 
 
+def load_product_or_404(product_id: int) -> Product:
+    """Return the product from the read cache, falling back to a reader lookup that populates it."""
+    product, generation = _cache_get(_PRODUCT_CACHE, product_id)
+    if product is not None:
+        return product
+    product = _product_from_row(fetch_product_or_404(product_id))
+    _cache_put(_PRODUCT_CACHE, product_id, product, generation)
+    return product
+
+
 # PUBLIC_INTERFACE
 @app.get(
     "/products",
@@ -149,10 +411,16 @@ def fetch_product_or_404(product_id: int) -> sqlite3.Row:
 )
 def list_products():
     """List all products."""
-    with get_db_cursor() as cur:
-        cur.execute("SELECT id, name, price, quantity FROM products ORDER BY id ASC")
-        rows = cur.fetchall()
-        return [Product(id=row["id"], name=row["name"], price=row["price"], quantity=row["quantity"]) for row in rows]
+    products, generation = _cache_get(_PRODUCT_LIST_CACHE, _PRODUCT_LIST_KEY)
+    if products is None:
+        with get_reader() as cur:
+            # Plain tuples instead of sqlite3.Row: positional access avoids a lookup per field per row
+            cur.row_factory = None
+            cur.execute(_SQL_LIST)
+            products = [{"id": r[0], "name": r[1], "price": r[2], "quantity": r[3]} for r in cur.fetchall()]
+        _cache_put(_PRODUCT_LIST_CACHE, _PRODUCT_LIST_KEY, products, generation)
+    # Rows already match the Product schema; encode directly instead of re-validating via response_model
+    return ORJSONResponse(products)
 
 
 # PUBLIC_INTERFACE
@@ -166,15 +434,122 @@ def list_products():
 )
 def create_product(payload: ProductCreate):
     """Create a new product and return it."""
-    with get_db_cursor() as cur:
+    with get_writer() as cur:
         cur.execute(
-            "INSERT INTO products (name, price, quantity) VALUES (?, ?, ?)",
-            (payload.name.strip(), float(payload.price), int(payload.quantity)),
+            _SQL_INSERT,
+            # Round price to 2 decimal places to avoid floating artifacts
+            (payload.name.strip(), round(float(payload.price), 2), int(payload.quantity)),
         )
         new_id = cur.lastrowid
-        cur.execute("SELECT id, name, price, quantity FROM products WHERE id = ?", (new_id,))
+        cur.execute(_SQL_GET_ONE, (new_id,))
         row = cur.fetchone()
-        return Product(id=row["id"], name=row["name"], price=row["price"], quantity=row["quantity"])
+    invalidate_product_cache()
+    return _product_from_row(row)
+
+
+# A bulk insert holds the single writer lock for its whole transaction; cap the batch so one
+# request cannot stall every other write.
+BULK_CREATE_MAX_ITEMS = int(os.getenv("BULK_CREATE_MAX_ITEMS", "1000"))
+
+
+# PUBLIC_INTERFACE
+@app.post(
+    "/products/bulk",
+    response_model=List[Product],
+    status_code=status.HTTP_201_CREATED,
+    tags=["products"],
+    summary="Create products in bulk",
+    description="Create several products in a single transaction. Returns the created products in input order.",
+)
+def create_products_bulk(
+    payloads: List[ProductCreate] = Body(
+        ..., description="Products to create", max_length=BULK_CREATE_MAX_ITEMS
+    ),
+):
+    """Create many products at once and return them."""
+    if not payloads:
+        return []
+    with get_writer() as cur:
+        cur.executemany(
+            _SQL_INSERT,
+            [(p.name.strip(), round(float(p.price), 2), int(p.quantity)) for p in payloads],
+        )
+        # AUTOINCREMENT ids are contiguous within this locked write transaction
+        cur.execute(_SQL_LAST_ROWID)
+        last_id = cur.fetchone()[0]
+        cur.execute(
+            _SQL_ID_RANGE,
+            (last_id - len(payloads) + 1, last_id),
+        )
+        rows = cur.fetchall()
+    invalidate_product_cache()
+    return [_product_from_row(row) for row in rows]
+
+
+# Declared before /products/{id} so the literal path is matched first.
+# PUBLIC_INTERFACE
+@app.get(
+    "/products/balance",
+    tags=["products"],
+    summary="Get total inventory balance",
+    description="Returns the total value of inventory as the sum over all products of price * quantity.",
+)
+def get_products_balance():
+    """
+    Calculate the total inventory value.
+
+    Reads the running total (in integer cents) from the single-row inventory_totals table,
+    which is kept current by triggers on products and rebuilt from the products table at startup.
+
+    If any database error occurs (e.g., file missing, table missing, or any unexpected condition),
+    falls back to computing the balance in memory by reading all rows. Reader pool exhaustion is
+    not a database error: DatabasePoolTimeout propagates and is served as 503.
+
+    Returns:
+        JSON object: {"total_balance": <float>}
+        - 0 if there are no products or in error conditions, ensuring a graceful response.
+    """
+    try:
+        # Primary path: O(1) lookup of the trigger-maintained total
+        with get_reader() as cur:
+            cur.execute(_SQL_TOTAL)
+            row = cur.fetchone()
+            if row is None:
+                raise LookupError("inventory_totals is not initialized")
+            total = row["total_cents"] / 100 if row["total_cents"] is not None else 0.0
+            # Normalize to 2 decimal places similar to price handling
+            return {"total_balance": round(float(total), 2)}
+    except DatabasePoolTimeout:
+        raise
+    except Exception:
+        # Fallback path: compute in memory
+        try:
+            with get_reader() as cur:
+                cur.row_factory = None
+                cur.execute(_SQL_PRICE_QUANTITY)
+                rows = cur.fetchall()
+            prices = [r[0] for r in rows]
+            quantities = [r[1] for r in rows]
+            try:
+                # Column-wise convert, multiply and sum entirely in C (map/operator.mul/fsum), no per-row
+                # Python frames. Converting first makes malformed TEXT values fail fast here rather than
+                # being "multiplied" as str * int repetition.
+                total = math.fsum(map(operator.mul, map(float, prices), map(int, quantities)))
+            except (TypeError, ValueError):
+                # Malformed values present: fall back to a tolerant per-row sum
+                total = 0.0
+                for price, quantity in zip(prices, quantities):
+                    try:
+                        total += float(price) * int(quantity)
+                    except Exception:
+                        # Skip malformed rows in worst case
+                        continue
+            return {"total_balance": round(float(total), 2)}
+        except DatabasePoolTimeout:
+            raise
+        except Exception:
+            # If even fallback fails, return 0 per requirement
+            return {"total_balance": 0.0}
 
 
 # PUBLIC_INTERFACE
@@ -189,8 +564,7 @@ def get_product(
     id: int = Path(..., description="The ID of the product to retrieve", ge=1)
 ):
     """Get a product by ID."""
-    row = fetch_product_or_404(id)
-    return Product(id=row["id"], name=row["name"], price=row["price"], quantity=row["quantity"])
+    return load_product_or_404(id)
 
 
 # PUBLIC_INTERFACE
@@ -206,20 +580,32 @@ def update_product(
     id: int = Path(..., description="The ID of the product to update", ge=1),
 ):
     """Update fields of a product."""
-    # Load current product
-    current = fetch_product_or_404(id)
-    new_name = current["name"] if payload.name is None else payload.name.strip()
-    new_price = current["price"] if payload.price is None else float(payload.price)
-    new_quantity = current["quantity"] if payload.quantity is None else int(payload.quantity)
-
-    with get_db_cursor() as cur:
+    # Only the columns present in the payload are written
+    assignments = []
+    params = []
+    if payload.name is not None:
+        assignments.append("name = ?")
+        params.append(payload.name.strip())
+    if payload.price is not None:
+        assignments.append("price = ?")
+        params.append(round(float(payload.price), 2))
+    if payload.quantity is not None:
+        assignments.append("quantity = ?")
+        params.append(int(payload.quantity))
+    if not assignments:
+        # Nothing to change: answer from the read side without taking the writer or dirtying a WAL page
+        return load_product_or_404(id)
+
+    with get_writer() as cur:
         cur.execute(
-            "UPDATE products SET name = ?, price = ?, quantity = ? WHERE id = ?",
-            (new_name, new_price, new_quantity, id),
+            _SQL_UPDATE.format(assignments=", ".join(assignments)),
+            (*params, id),
         )
-        cur.execute("SELECT id, name, price, quantity FROM products WHERE id = ?", (id,))
         row = cur.fetchone()
-        return Product(id=row["id"], name=row["name"], price=row["price"], quantity=row["quantity"])
+    if row is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=f"Product {id} not found")
+    invalidate_product_cache(id)
+    return _product_from_row(row)
 
 
 # PUBLIC_INTERFACE
@@ -234,62 +620,16 @@ def delete_product(
     id: int = Path(..., description="The ID of the product to delete", ge=1),
 ):
     """Delete a product by ID."""
-    # Ensure exists
-    _ = fetch_product_or_404(id)
-    with get_db_cursor() as cur:
-        cur.execute("DELETE FROM products WHERE id = ?", (id,))
+    with get_writer() as cur:
+        cur.execute(_SQL_DELETE, (id,))
+        deleted = cur.rowcount
+    if deleted == 0:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=f"Product {id} not found")
+    invalidate_product_cache(id)
     # 204 No Content
     return None
 
 
-# PUBLIC_INTERFACE
-@app.get(
-    "/products/balance",
-    tags=["products"],
-    summary="Get total inventory balance",
-    description="Returns the total value of inventory as the sum over all products of price * quantity.",
-)
-def get_products_balance():
-    """
-    Calculate the total inventory value.
-
-    Tries to perform efficient aggregation in SQLite using:
-      SELECT COALESCE(SUM(price * quantity), 0) AS total FROM products
-
-    If any database error occurs (e.g., file missing, table missing, or any unexpected condition),
-    falls back to computing the balance in memory by reading all rows.
-
-    Returns:
-        JSON object: {"total_balance": <float>}
-        - 0 if there are no products or in error conditions, ensuring a graceful response.
-    """
-    try:
-        # Primary path: efficient SQL aggregation
-        with get_db_cursor() as cur:
-            cur.execute("SELECT COALESCE(SUM(price * quantity), 0) AS total FROM products")
-            row = cur.fetchone()
-            total = row["total"] if row and row["total"] is not None else 0.0
-            # Normalize to 2 decimal places similar to price handling
-            return {"total_balance": round(float(total), 2)}
-    except Exception:
-        # Fallback path: compute in memory
-        try:
-            with get_db_cursor() as cur:
-                cur.execute("SELECT price, quantity FROM products")
-                rows = cur.fetchall()
-                total = 0.0
-                for r in rows or []:
-                    try:
-                        total += float(r["price"]) * int(r["quantity"])
-                    except Exception:
-                        # Skip malformed rows in worst case
-                        continue
-                return {"total_balance": round(float(total), 2)}
-        except Exception:
-            # If even fallback fails, return 0 per requirement
-            return {"total_balance": 0.0}
-
-
 if __name__ == "__main__":
     # Entrypoint to run via: python -m src.api.main
     import uvicorn
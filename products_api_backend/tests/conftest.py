@@ -0,0 +1,15 @@
+import pytest
+from fastapi.testclient import TestClient
+
+from src.api import main
+
+
+@pytest.fixture
+def client(tmp_path, monkeypatch):
+    """TestClient running the app lifespan against a fresh SQLite database file."""
+    monkeypatch.setattr(main, "DB_FILE_PATH", str(tmp_path / "products.db"))
+    # Each test gets a fresh database, so drop every cached product, not just the listing
+    main._PRODUCT_CACHE.clear()
+    main.invalidate_product_cache()
+    with TestClient(main.app) as test_client:
+        yield test_client
@@ -0,0 +1,230 @@
+import os
+import subprocess
+import sys
+
+import pytest
+
+from src.api import main
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def create(client, name, price, quantity):
+    response = client.post("/products", json={"name": name, "price": price, "quantity": quantity})
+    assert response.status_code == 201
+    return response.json()
+
+
+def test_balance_route_is_not_shadowed_by_product_id(client):
+    create(client, "Widget", 2.5, 4)
+    create(client, "Gadget", 1.25, 2)
+
+    response = client.get("/products/balance")
+
+    assert response.status_code == 200
+    assert response.json() == {"total_balance": 12.5}
+
+
+def test_balance_returns_exact_zero_after_all_products_are_deleted(client):
+    first = create(client, "Widget", 0.1, 3)
+    second = create(client, "Gadget", 0.7, 7)
+    assert client.get("/products/balance").json() == {"total_balance": 5.2}
+
+    assert client.delete(f"/products/{second['id']}").status_code == 204
+    assert client.delete(f"/products/{first['id']}").status_code == 204
+
+    assert client.get("/products").json() == []
+    balance = client.get("/products/balance").json()["total_balance"]
+    assert balance == 0.0
+    assert str(balance) == "0.0"
+
+
+def test_balance_tracks_updates(client):
+    product = create(client, "Widget", 0.1, 3)
+    client.put(f"/products/{product['id']}", json={"price": 0.35, "quantity": 10})
+
+    assert client.get("/products/balance").json() == {"total_balance": 3.5}
+
+
+def test_bulk_create_returns_new_ids_in_input_order_after_delete(client):
+    create(client, "First", 1, 1)
+    second = create(client, "Second", 1, 1)
+    assert client.delete(f"/products/{second['id']}").status_code == 204
+
+    response = client.post(
+        "/products/bulk",
+        json=[
+            {"name": "Charlie", "price": 3, "quantity": 3},
+            {"name": "Alpha", "price": 1, "quantity": 1},
+            {"name": "Bravo", "price": 2, "quantity": 2},
+        ],
+    )
+
+    assert response.status_code == 201
+    created = response.json()
+    # AUTOINCREMENT never reuses the deleted id, so the batch gets fresh contiguous ids
+    assert [p["id"] for p in created] == [second["id"] + 1, second["id"] + 2, second["id"] + 3]
+    assert [p["name"] for p in created] == ["Charlie", "Alpha", "Bravo"]
+    assert [p["name"] for p in client.get("/products").json()] == ["First", "Charlie", "Alpha", "Bravo"]
+
+
+def test_bulk_create_with_empty_list_creates_nothing(client):
+    response = client.post("/products/bulk", json=[])
+
+    assert response.status_code == 201
+    assert response.json() == []
+    assert client.get("/products").json() == []
+
+
+def test_bulk_create_rejects_oversized_batch(client):
+    payload = [{"name": "Item", "price": 1, "quantity": 1}] * (main.BULK_CREATE_MAX_ITEMS + 1)
+
+    assert client.post("/products/bulk", json=payload).status_code == 422
+    assert client.get("/products").json() == []
+
+
+def test_exhausted_reader_pool_returns_503_instead_of_wrong_answers(client, monkeypatch):
+    create(client, "Widget", 5, 10)
+    monkeypatch.setattr(main, "DB_POOL_TIMEOUT", 0.05)
+    held = []
+    while not main._READERS.empty():
+        held.append(main._READERS.get_nowait())
+    try:
+        products = client.get("/products")
+        balance = client.get("/products/balance")
+    finally:
+        for conn in held:
+            main._READERS.put_nowait(conn)
+
+    assert products.status_code == 503
+    assert balance.status_code == 503
+    assert client.get("/products/balance").json() == {"total_balance": 50.0}
+
+
+@pytest.mark.parametrize("size", ["0", "-1"])
+def test_reader_pool_size_below_one_is_rejected_at_import(size):
+    env = {**os.environ, "DB_READER_POOL_SIZE": size}
+    result = subprocess.run(
+        [sys.executable, "-c", "import src.api.main"],
+        cwd=PROJECT_ROOT,
+        env=env,
+        capture_output=True,
+        text=True,
+        timeout=30,
+    )
+
+    assert result.returncode != 0
+    assert "DB_READER_POOL_SIZE must be at least 1" in result.stderr
+
+
+def test_thread_limit_matches_reader_pool(client):
+    import anyio.to_thread
+
+    limit = client.portal.call(lambda: anyio.to_thread.current_default_thread_limiter().total_tokens)
+
+    assert limit == main.DB_READER_POOL_SIZE + 1
+
+
+def test_balance_fallback_skips_malformed_rows(client, monkeypatch):
+    create(client, "Widget", 2.5, 4)
+    # CHECK(price >= 0) accepts TEXT, so a malformed row can exist in the table
+    with main.get_writer() as cur:
+        cur.execute("INSERT INTO products (name, price, quantity) VALUES ('Broken', 'abc', 1000000)")
+    monkeypatch.setattr(main, "_SQL_TOTAL", "SELECT total_cents FROM missing_table")
+
+    assert client.get("/products/balance").json() == {"total_balance": 10.0}
+
+
+def test_update_is_visible_after_cache_warming_reads(client):
+    product = create(client, "Widget", 2.5, 4)
+    client.get(f"/products/{product['id']}")
+    client.get("/products")
+
+    client.put(f"/products/{product['id']}", json={"name": "Renamed", "quantity": 9})
+
+    expected = {"id": product["id"], "name": "Renamed", "price": 2.5, "quantity": 9}
+    assert client.get(f"/products/{product['id']}").json() == expected
+    assert client.get("/products").json() == [expected]
+
+
+def test_delete_is_visible_after_cache_warming_reads(client):
+    product = create(client, "Widget", 2.5, 4)
+    client.get(f"/products/{product['id']}")
+    client.get("/products")
+
+    client.delete(f"/products/{product['id']}")
+
+    assert client.get(f"/products/{product['id']}").status_code == 404
+    assert client.get("/products").json() == []
+
+
+def test_create_is_visible_after_cache_warming_reads(client):
+    first = create(client, "Widget", 2.5, 4)
+    client.get("/products")
+
+    second = create(client, "Gadget", 1, 1)
+    bulk = client.post("/products/bulk", json=[{"name": "Gizmo", "price": 3, "quantity": 3}]).json()
+
+    assert client.get("/products").json() == [first, second, *bulk]
+
+
+def test_cache_put_with_stale_generation_is_dropped():
+    _, stale_generation = main._cache_get(main._PRODUCT_CACHE, 12345)
+    # A write lands between the read's cache miss and its put
+    main.invalidate_product_cache(12345)
+
+    main._cache_put(main._PRODUCT_CACHE, 12345, "stale", stale_generation)
+    cached, current_generation = main._cache_get(main._PRODUCT_CACHE, 12345)
+    assert cached is None
+
+    main._cache_put(main._PRODUCT_CACHE, 12345, "fresh", current_generation)
+    assert main._cache_get(main._PRODUCT_CACHE, 12345)[0] == "fresh"
+    main.invalidate_product_cache(12345)
+
+
+@pytest.mark.parametrize(
+    "changes",
+    [{"name": "  Renamed  "}, {"price": 3.456}, {"quantity": 0}, {"price": 1, "quantity": 2}],
+)
+def test_partial_update_only_changes_provided_columns(client, changes):
+    product = create(client, "Widget", 2.5, 4)
+
+    response = client.put(f"/products/{product['id']}", json=changes)
+
+    expected = {**product, **changes}
+    if "name" in changes:
+        expected["name"] = changes["name"].strip()
+    if "price" in changes:
+        expected["price"] = round(changes["price"], 2)
+    assert response.status_code == 200
+    assert response.json() == expected
+    assert client.get(f"/products/{product['id']}").json() == expected
+
+
+def test_update_missing_product_returns_404(client):
+    response = client.put("/products/999", json={"quantity": 1})
+
+    assert response.status_code == 404
+    assert client.get("/products").json() == []
+
+
+def test_empty_update_returns_current_row_without_writing(client, monkeypatch):
+    product = create(client, "Widget", 2.5, 4)
+
+    def no_writes():
+        raise AssertionError("empty update must not take the writer")
+
+    monkeypatch.setattr(main, "get_writer", no_writes)
+
+    response = client.put(f"/products/{product['id']}", json={})
+    assert response.status_code == 200
+    assert response.json() == product
+    assert client.put("/products/999", json={}).status_code == 404
+
+
+def test_delete_missing_product_returns_404(client):
+    product = create(client, "Widget", 2.5, 4)
+
+    assert client.delete("/products/999").status_code == 404
+    assert client.delete(f"/products/{product['id']}").status_code == 204
+    assert client.delete(f"/products/{product['id']}").status_code == 404